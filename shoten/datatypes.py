@@ -3,16 +3,15 @@
 
 #from __future__ import annotations
 
-from array import array
 from collections import defaultdict, Counter
-from datetime import datetime
+from datetime import date
 from typing import Any, Dict, Iterator, List, Union
 
 # Python 3.7+
 # from numpy.typing import ArrayLike  # type: ignore[import]
 
 
-TODAY = datetime.now()
+TODAY = date.today()
 
 
 ARRAY_TYPE = 'H'
@@ -28,8 +27,9 @@ class Entry:
         self.absfreq: int
         self.headings = head
         self.mean: float
-        self.series_abs: Any = array('f')
-        self.series_rel: Any = array('f')
+        # frequency series are only set during frequency computations
+        self.series_abs: Any
+        self.series_rel: Any
         self.sources: Dict[str, int] = defaultdict(int)
         self.stddev: float
         self.time_series: Dict[int, int] = defaultdict(int)
@@ -8,26 +8,31 @@ import pickle
 import re
 
 from array import array
-from collections import Counter, defaultdict
+from collections import Counter
 from concurrent.futures import as_completed, ProcessPoolExecutor
-from datetime import datetime
+from datetime import date
 from functools import lru_cache, partial
+from itertools import chain
 from os import cpu_count, path, walk  # cpu_count
 from pathlib import Path
-from typing import Any, DefaultDict, Dict, Iterator, List, Match, Optional, Pattern, Set, Tuple, Union
+from typing import Any, BinaryIO, Counter as TypingCounter, Dict, FrozenSet, Iterator, List, Optional, Pattern, Set, Tuple, Union
 
 import numpy as np  # type: ignore[import]
 
 from courlan import extract_domain  # type: ignore
-from lxml.etree import XMLSyntaxError, fromstring  # type: ignore[import]
+from lxml.etree import XMLSyntaxError, iterparse  # type: ignore[import]
 from simplemma import lemmatize, simple_tokenizer, is_known  # type: ignore
 
-from .datatypes import dict_sum, sum_entry, flatten_series, ARRAY_TYPE, Entry, MAX_SERIES_VAL, TODAY
+from .datatypes import dict_sum, sum_entry, ARRAY_TYPE, Entry, MAX_SERIES_VAL, TODAY
 from .filters import combined_filters, is_relevant_input, MIN_LENGTH
 
 
 THREADNUM = min(cpu_count(), 16)  # type: ignore[type-var]
+LEMMA_BATCHSIZE = 10000
+FREQ_BLOCKSIZE = 4096
 NSPACE = {"tei": "http://www.tei-c.org/ns/1.0"}
+TEI_PREFIX = f"{{{NSPACE['tei']}}}"
+TEI_TAGS = tuple(TEI_PREFIX + t for t in ('author', 'date', 'fw', 'head', 'ptr', 'publisher', 'teiHeader', 'text'))
 DATESEARCH = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}')
 
 
@@ -49,12 +54,13 @@ def find_files(dirname: str, maxdiff: int) -> Iterator[str]:
 def calc_timediff(mydate: str) -> Optional[int]:
     "Compute the difference in days between today and a date in YYYY-MM-DD format."
     try:
-        thisday = datetime(int(mydate[:4]), int(mydate[5:7]), int(mydate[8:10]))
+        thisday = date(int(mydate[:4]), int(mydate[5:7]), int(mydate[8:10]))
     except (TypeError, ValueError):
         return None
     return (TODAY - thisday).days
 
 
+@lru_cache(maxsize=262144)
 def filter_lemmaform(token: str, lang: Union[str, Tuple[str, ...], None] = ('de', 'en'), lemmafilter: bool = True) -> Optional[str]:
     "Determine if the token is to be processed and try to lemmatize it."
     # potential new words only
@@ -69,31 +75,47 @@ def filter_lemmaform(token: str, lang: Union[str, Tuple[str, ...], None] = ('de'
 
 def putinvocab_single(myvocab: Dict[str, Entry], wordform: str, timediff: int, *, source: Optional[str]=None, inheadings: bool=False) -> Dict[str, Entry]:
     "Store a single word form in the vocabulary or add a new occurrence to it."
-    if wordform not in myvocab:
-        myvocab[wordform] = Entry(head=inheadings)
-    elif inheadings and myvocab[wordform].headings is False:
-        myvocab[wordform].headings = True
-    myvocab[wordform].time_series[timediff] += 1
+    entry = myvocab.get(wordform)
+    if entry is None:
+        entry = myvocab[wordform] = Entry(head=inheadings)
+    elif inheadings and entry.headings is False:
+        entry.headings = True
+    entry.time_series[timediff] += 1
     if source:
-        # slower: myvocab[wordform].sources.update(source)
-        myvocab[wordform].sources[source] += 1
+        # slower: entry.sources.update(source)
+        entry.sources[source] += 1
     return myvocab
 
 
-def putinvocab_multi(vocab: Dict[str, Entry], result: Optional[Tuple[Dict[str, int], int, Optional[str], Set[Union[Match[str], str]]]]) -> Dict[str, Entry]:
+def putinvocab_multi(vocab: Dict[str, Entry], result: Optional[Tuple[Dict[str, int], int, Optional[str], FrozenSet[str]]]) -> Dict[str, Entry]:
     "Store a series of word forms in the vocabulary."
     if not result:
         return vocab
     tokens, timediff, source, headwords = result
-    for token in tokens:
-        if token not in vocab:
-            vocab[token] = Entry(head=token in headwords)
-        elif token in headwords and vocab[token].headings is False:
-            vocab[token].headings = True
-        vocab[token].time_series[timediff] += tokens[token]
+    for token, count in tokens.items():
+        entry = vocab.get(token)
+        if entry is None:
+            entry = vocab[token] = Entry(head=token in headwords)
+        elif token in headwords and entry.headings is False:
+            entry.headings = True
+        entry.time_series[timediff] += count
         if source:
-            # slower: myvocab[wordform].sources.update(source)
-            vocab[token].sources[source] += 1
+            # slower: entry.sources.update(source)
+            entry.sources[source] += 1
+    return vocab
+
+
+def merge_vocab(vocab: Dict[str, Entry], other: Dict[str, Entry]) -> Dict[str, Entry]:
+    "Add the entries of a partial vocabulary to the main one."
+    for token, entry in other.items():
+        existing = vocab.get(token)
+        if existing is None:
+            vocab[token] = entry
+            continue
+        existing.time_series = dict_sum(existing.time_series, entry.time_series)
+        existing.sources = dict_sum(existing.sources, entry.sources)
+        if entry.headings is True:
+            existing.headings = True
     return vocab
 
 
@@ -103,20 +125,24 @@ def prune_vocab(vocab: Dict[str, Entry], first: str, second: str) -> Dict[str, E
         vocab[first] = Entry()
     if second not in vocab:
         vocab[second] = Entry()
-    # sum up series (faster)
-    vocab[second].time_series = dict_sum(vocab[first].time_series, vocab[second].time_series)
-    # sum up sources (faster)
-    vocab[second].sources = dict_sum(vocab[first].sources, vocab[second].sources)
+    src, dst = vocab[first], vocab[second]
+    # sum up series in place, iterating over the entry to be deleted
+    dst.time_series = dict_sum(dst.time_series, src.time_series)
+    # sum up sources in place
+    dst.sources = dict_sum(dst.sources, src.sources)
     # set heading boolean
-    if vocab[first].headings is True:
-        vocab[second].headings = True
+    if src.headings is True:
+        dst.headings = True
     return vocab
 
 
 def dehyphen_vocab(vocab: Dict[str, Entry]) -> Dict[str, Entry]:
     "Remove hyphens in words if a variant without hyphens exists."
     deletions = []
-    for wordform in [w for w in vocab if '-' in w]:
+    # no keys are added to the vocabulary in this loop, iterate over it directly
+    for wordform in vocab:
+        if '-' not in wordform:
+            continue
         candidate = wordform.replace('-', '').lower()
         if wordform[0].isupper():
             candidate = candidate.capitalize()
@@ -129,13 +155,30 @@ def dehyphen_vocab(vocab: Dict[str, Entry]) -> Dict[str, Entry]:
     return vocab
 
 
-def refine_vocab(myvocab: Dict[str, Entry], lang: Union[str, Tuple[str, ...], None]=None, lemmafilter: bool=False, dehyphenation: bool=True) -> Dict[str, Entry]:
+def lemmatize_batch(tokens: List[str], lang: Union[str, Tuple[str, ...], None], lemmafilter: bool) -> List[Optional[str]]:
+    "Apply lemma filtering to a batch of tokens (useful for multiprocessing)."
+    return [filter_lemmaform(t, lang=lang, lemmafilter=lemmafilter) for t in tokens]
+
+
+def refine_vocab(myvocab: Dict[str, Entry], lang: Union[str, Tuple[str, ...], None]=None, lemmafilter: bool=False, dehyphenation: bool=True, threads: Optional[int]=1) -> Dict[str, Entry]:
     """Refine the word list, currently: lemmatize, regroup forms with/without hyphens,
        and convert time series to numpy array."""
     if lang is not None:
+        tokens = list(myvocab)
+        # no language data: spare simplemma's attempts to (re-)load it on every call
+        if not lang:
+            lemmata: List[Optional[str]] = list(tokens)
+        # large vocabularies: the cost depends on the start method, forked workers
+        # inherit the language data and filter_lemmaform cache of the parent process,
+        # spawned workers have to load the data and fill their own cache
+        elif threads != 1 and len(tokens) > LEMMA_BATCHSIZE:
+            batches = [tokens[i:i+LEMMA_BATCHSIZE] for i in range(0, len(tokens), LEMMA_BATCHSIZE)]
+            with ProcessPoolExecutor(max_workers=threads) as executor:
+                lemmata = list(chain.from_iterable(executor.map(partial(lemmatize_batch, lang=lang, lemmafilter=lemmafilter), batches)))
+        else:
+            lemmata = lemmatize_batch(tokens, lang, lemmafilter)
         changes, deletions = [], []
-        for token in myvocab:
-            lemma = filter_lemmaform(token, lang=lang, lemmafilter=lemmafilter)
+        for token, lemma in zip(tokens, lemmata):
             #if is_relevant_input(lemma) is True:
             if lemma is None or len(lemma) < MIN_LENGTH:
                 deletions.append(token)
@@ -153,54 +196,82 @@ def refine_vocab(myvocab: Dict[str, Entry], lang: Union[str, Tuple[str, ...], No
     return myvocab
 
 
-def read_file(filepath: str, *, maxdiff: int=1000, mindiff: int=0, authorregex: Optional[Pattern[str]]=None, details: bool=True) -> Optional[Tuple[Dict[str, int], int, Optional[str], Set[Union[Match[str], str]]]]:
+def store_tei_field(fields: Dict[str, Any], tag: str, elem: Any, details: bool) -> None:
+    "Store the content of a TEI element among the document fields, first occurrence only."
+    if tag in ('fw', 'head'):
+        if details:
+            fields['bow'].append(' '.join(elem.itertext()))
+    elif tag in fields:
+        return
+    elif tag == 'date':
+        if next(elem.iterancestors(TEI_PREFIX + 'publicationStmt'), None) is not None:
+            fields['date'] = elem.text or ''
+    elif tag == 'ptr':
+        if elem.get('type') == 'URL' and elem.get('target') is not None:
+            fields['ptr'] = elem.get('target')
+    elif tag in ('author', 'publisher'):
+        fields[tag] = elem.text or ''
+
+
+def iter_tei(filehandle: BinaryIO, details: bool=True) -> Iterator[Dict[str, Any]]:
+    """Stream through a XML TEI document in a single pass: yield the fields
+       once the header is complete, then again at the end of the text."""
+    fields: Dict[str, Any] = {'bow': [], 'text': ''}
+    for _, elem in iterparse(filehandle, events=('end',), tag=TEI_TAGS):
+        tag = elem.tag[len(TEI_PREFIX):]
+        if tag == 'teiHeader':
+            yield fields
+        elif tag == 'text':
+            fields['text'] = ' '.join(elem.itertext())
+            break
+        else:
+            store_tei_field(fields, tag, elem, details)
+    yield fields
+
+
+def read_file(filepath: str, *, maxdiff: int=1000, mindiff: int=0, authorregex: Optional[Pattern[str]]=None, details: bool=True) -> Optional[Tuple[Dict[str, int], int, Optional[str], FrozenSet[str]]]:
     "Extract word forms from a XML TEI file generated by Trafilatura."
-    # read data
-    with open(filepath, 'r', encoding='utf-8') as filehandle:
+    # read data, the header comes first so that the text is only parsed if necessary
+    with open(filepath, 'rb') as filehandle:
         try:
-            mytree = fromstring(filehandle.read())
+            stream = iter_tei(filehandle, details)
+            fields = next(stream)
+            # XML-TEI: compute difference in days
+            timediff = calc_timediff(fields.get('date'))
+            if timediff is None or not mindiff < timediff <= maxdiff:
+                return None
+            # XML-TEI: filter author
+            # todo: add authorship flag instead?
+            author = fields.get('author')
+            if authorregex is not None and author is not None and authorregex.search(author):
+                return None
+            # no author string in the document, log?
+            fields = next(stream, fields)
         except XMLSyntaxError:
             return None
     # todo: XML-TEI + XML
-    # XML-TEI: compute difference in days
-    timediff = calc_timediff(mytree.findtext(".//tei:publicationStmt//tei:date", namespaces=NSPACE))
-    if timediff is None or not mindiff < timediff <= maxdiff:
-        return None
-    # XML-TEI: filter author
-    # todo: add authorship flag instead?
-    if authorregex is not None:
-        author = mytree.findtext('.//tei:author', namespaces=NSPACE)
-        if author is not None and authorregex.search(author):
-            return None
-        # no author string in the document, log?
-    # source: extract domain from URL first
+    # source: extract domain from URL first, else use TEI publisher info
     source = None
+    headwords: FrozenSet[str] = frozenset()
     if details:
-        url_elem = mytree.find('.//tei:ptr[@type="URL"][@target]', namespaces=NSPACE)
-        if url_elem is not None:
-            source = extract_domain(url_elem.get('target'), fast=True)
-        # use TEI publisher info
-        else:
-            source = mytree.findtext('.//tei:publisher', namespaces=NSPACE)
-    # headings
-    headwords = set()
-    if details:
-        bow = [' '.join(h.itertext()) for h in mytree.xpath('.//tei:fw|.//tei:head', namespaces=NSPACE)]
-        headwords = {t for t in simple_tokenizer(' '.join(bow)) if is_relevant_input(t)}
-    # process
-    tokens: DefaultDict[str, int] = defaultdict(int)
-    for token in simple_tokenizer(' '.join(mytree.find('.//tei:text', namespaces=NSPACE).itertext())):
-        # form and regex-based filter
-        if is_relevant_input(token) is True:
-            tokens[token] += 1  # type: ignore[index]
-            # return tuple
-            #yield token, timediff, source, token in headwords  # type: ignore[misc]
+        url = fields.get('ptr')
+        source = extract_domain(url, fast=True) if url is not None else fields.get('publisher')
+        # headings
+        if fields['bow']:
+            candidates: Set[str] = set(chain.from_iterable(map(simple_tokenizer, fields['bow'])))  # type: ignore[arg-type]
+            headwords = frozenset(t for t in candidates if is_relevant_input(t))
+    # process: count in bulk, then apply form and regex-based filter to distinct tokens only
+    counts: TypingCounter[str] = Counter(simple_tokenizer(fields['text']))  # type: ignore[arg-type]
+    tokens: Dict[str, int] = {t: c for t, c in counts.items() if is_relevant_input(t)}
     return tokens, timediff, source, headwords
 
 
-def parallel_reads(readfunc: Any, batch: Any) -> List[Any]:
-    "Read batches of files (useful for multiprocessing)."
-    return [readfunc(f) for f in batch]
+def parallel_reads(readfunc: Any, batch: Any) -> Dict[str, Entry]:
+    "Read batches of files and aggregate them into a partial vocabulary (useful for multiprocessing)."
+    vocab: Dict[str, Entry] = {}
+    for filepath in batch:
+        vocab = putinvocab_multi(vocab, readfunc(filepath))
+    return vocab
 
 
 def gen_wordlist(mydir: str, *, langcodes: Union[str, Tuple[str, ...], None]=None, maxdiff: int=1000, mindiff: int=0, authorregex: Optional[Pattern[str]]=None, lemmafilter: bool=False, details: bool=True, threads: Optional[int]=THREADNUM) -> Any:  # ArrayLike
@@ -231,10 +302,9 @@ def gen_wordlist(mydir: str, *, langcodes: Union[str, Tuple[str, ...], None]=Non
                 batches.append(executor.submit(parallel_reads, readfunc, tasks))
             # finish
             for future in as_completed(batches):
-                for result in future.result():
-                    myvocab = putinvocab_multi(myvocab, result)
+                myvocab = merge_vocab(myvocab, future.result())
     # post-processing
-    myvocab = refine_vocab(myvocab, lang=langcodes, lemmafilter=lemmafilter)
+    myvocab = refine_vocab(myvocab, lang=langcodes, lemmafilter=lemmafilter, threads=threads)
     return myvocab
 
 
@@ -269,7 +339,8 @@ def load_wordlist(myfile: str, langcodes: Union[str, Tuple[str, ...], None]=None
 
 def pickle_wordinfo(mydict: Dict[str, Entry], filepath: str) -> None:
     "Store the frequency dict in a compressed format."
-    with gzip.open(filepath, 'w') as filehandle:
+    # fast compression: much quicker than the default level 9 for a slightly larger file
+    with gzip.open(filepath, 'w', compresslevel=1) as filehandle:
         pickle.dump(mydict, filehandle, protocol=pickle.HIGHEST_PROTOCOL)
 
 
@@ -296,91 +367,98 @@ def calculate_bins(vocab: Dict[str, Entry], interval: int=7, maxdiff: int=1000)
     for entry in vocab.values():
         oldest = max(oldest, max(entry.time_series))
         newest = min(newest, min(entry.time_series))
-    # return bins corresponding to boundaries and interval
-    return [d for d in range(oldest, newest, -1) if d % interval == 0 and oldest - d >= interval]
+    # return bins corresponding to boundaries and interval:
+    # multiples of the interval, starting one full interval after the oldest day
+    start = (oldest - interval) // interval * interval
+    return list(range(start, newest, -interval))
 
 
 def refine_frequencies(vocab: Dict[str, Entry], bins: List[int]) -> Dict[str, Entry]:
     "Adjust the frequencies to a time frame and remove superfluous words."
     deletions = []
     # remove occurrences that are out of bounds: no complete week
-    for word in vocab:
-        new_series = [d for d in flatten_series(vocab[word]) if bins[-1] <= d < bins[0]]
-        if len(new_series) <= 1:
+    oldest, newest = bins[0], bins[-1]
+    for word, entry in vocab.items():
+        # filter the day counts directly instead of expanding and re-counting them
+        new_series = {d: c for d, c in entry.time_series.items() if newest <= d < oldest}
+        if sum(new_series.values()) <= 1:
             deletions.append(word)
         else:
-            vocab[word].time_series = Counter(new_series)
+            entry.time_series = new_series
     # remove words with too little data
     for word in deletions:
         del vocab[word]
     return vocab
 
 
-def compute_frequencies(vocab: Dict[str, Entry], bins: List[int]) -> Tuple[Dict[str, Entry], List[int]]:
+def compute_frequencies(vocab: Dict[str, Entry], bins: List[int], interval: int=7) -> Tuple[Dict[str, Entry], List[int]]:
     "Compute absolute frequencies of words."
-    timeseries = [0] * len(bins)
-    # necessary for old code to work
-    oldestday = max(bins) + 6
-    newestday = min(bins) - 6
-    # frequency computations
-    freqsum = sum(sum_entry(vocab[l]) for l in vocab)
-    for wordform in vocab:
-        freqseries = []
+    timeseries = np.zeros(len(bins), dtype=np.int64)
+    # bins are the lower bounds of each time frame, in descending order
+    lower_bounds = np.array(bins[::-1], dtype=np.int64)
+    upper_bound = bins[0] + interval
+    entries = list(vocab.values())
+    freqsum = sum(sum_entry(e) for e in entries)
+    # process blocks of words as (words, bins) matrices to bound memory use
+    for start in range(0, len(entries), FREQ_BLOCKSIZE):
+        block = entries[start:start+FREQ_BLOCKSIZE]
+        # flatten the time series: word index, day, count
+        lengths = [len(e.time_series) for e in block]
+        total_length = sum(lengths)
+        days = np.fromiter(chain.from_iterable(e.time_series.keys() for e in block), dtype=np.int64, count=total_length)
+        counts = np.fromiter(chain.from_iterable(e.time_series.values() for e in block), dtype=np.int64, count=total_length)
+        word_ids = np.repeat(np.arange(len(block)), lengths)
         # parts per million
-        ppm = (sum_entry(vocab[wordform]) / freqsum)*1000000
-        vocab[wordform].total = float(f'{ppm:.3f}')
-        ## OLD code
-        mysum = 0
-        mydays = vocab[wordform].time_series
-        for day in range(oldestday, newestday, -1):
-            if day in mydays:
-                mysum += mydays[day]
-            if day % 7 == 0:
-                # prevent OverflowError according to array type
-                freqseries.append(min(MAX_SERIES_VAL, mysum))
-                mysum = 0
-        vocab[wordform].series_abs = array(ARRAY_TYPE, freqseries)
-        for i in range(len(bins)):
-            timeseries[i] += vocab[wordform].series_abs[i]  # type: ignore[call-overload]
-        ## NEW code: problem here
-        #days = Counter(vocab[wordform].time_series)
-        #for i, split in enumerate(bins):
-        #    if i != 0:
-        #        total = sum(days[d] for d in days if bins[i-1] < d <= split)
-        #    else:
-        #        total = sum(days[d] for d in days if d <= split)
-        #    # prevent OverflowError according to array type
-        #    total = min(MAX_SERIES_VAL, total)
-        #    freqseries.append(total)
-        #    timeseries[i] += total
-        #vocab[wordform].series_abs = array(ARRAY_TYPE, reversed(freqseries))
-        ## WRAP UP
-        # spare memory
-        del vocab[wordform].time_series
-    return vocab, timeseries  # new code: list(reversed(timeseries)) ??
+        ppms = (np.bincount(word_ids, weights=counts, minlength=len(block)) / freqsum)*1000000
+        # assign each day to its time frame (newest last) and sum up the occurrences
+        mask = (days >= lower_bounds[0]) & (days < upper_bound)
+        bin_ids = len(bins) - np.searchsorted(lower_bounds, days[mask], side='right')
+        freqmatrix = np.bincount(word_ids[mask]*len(bins) + bin_ids, weights=counts[mask], minlength=len(block)*len(bins))
+        # prevent OverflowError according to array type
+        clipped = np.minimum(freqmatrix, MAX_SERIES_VAL).astype(np.uint16).reshape(len(block), len(bins))
+        timeseries += clipped.sum(axis=0, dtype=np.int64)
+        for entry, ppm, freqseries in zip(block, ppms.tolist(), clipped):
+            entry.total = float(f'{ppm:.3f}')
+            entry.series_abs = array(ARRAY_TYPE, freqseries.tobytes())
+            # spare memory
+            del entry.time_series
+    return vocab, timeseries.tolist()
 
 
 def combine_frequencies(vocab: Dict[str, Entry], bins: List[int], timeseries: List[int]) -> Dict[str, Entry]:
     "Compute relative frequencies and word statistics."
     deletions = []
-    for wordform in vocab:
-        for i in range(len(bins)):
-            try:
-                vocab[wordform].series_rel.append((vocab[wordform].series_abs[i] / timeseries[i])*1000000)
-            except ZeroDivisionError:
-                vocab[wordform].series_rel.append(0.0)
+    totals = np.array(timeseries, dtype=np.float64)
+    words = list(vocab)
+    # process blocks of words as (words, bins) matrices to bound memory use
+    for start in range(0, len(words), FREQ_BLOCKSIZE):
+        block = words[start:start+FREQ_BLOCKSIZE]
+        abs_matrix = np.array([vocab[w].series_abs for w in block], dtype=np.uint32).reshape(len(block), len(bins))
+        # relative frequencies, zero if there is no data for a time frame
+        rel_matrix = (np.divide(abs_matrix, totals, out=np.zeros(abs_matrix.shape), where=totals != 0)*1000000).astype(np.float32)
         # take non-zero values and perform calculations
-        series = np.array([f for f in vocab[wordform].series_rel if f != 0.0], dtype="float32")
-        # todo: skip if series too short
-        # delete rare words to prevent unreliable figures
-        #if len(series) < len(bins) / 2:
-        if len(series) < 3 <= len(bins):
-            deletions.append(wordform)
-            continue
-        vocab[wordform].stddev = float(f'{np.std(series):.3f}')
-        vocab[wordform].mean = float(f'{np.mean(series):.3f}')
-        # spare memory
-        del vocab[wordform].series_abs
+        nonzero = rel_matrix != 0.0
+        lengths = nonzero.sum(axis=1)
+        counts = lengths.astype(np.float32)
+        # rows without any value yield NaN as before
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = rel_matrix.sum(axis=1) / counts
+            deviations = rel_matrix - means[:, None]
+            deviations[~nonzero] = 0.0
+            stddevs = np.sqrt((deviations*deviations).sum(axis=1) / counts)
+        for i, wordform in enumerate(block):
+            # todo: skip if series too short
+            # delete rare words to prevent unreliable figures
+            #if len(series) < len(bins) / 2:
+            if lengths[i] < 3 <= len(bins):
+                deletions.append(wordform)
+                continue
+            entry = vocab[wordform]
+            entry.series_rel = array('f', rel_matrix[i].tobytes())
+            entry.stddev = float(f'{stddevs[i]:.3f}')
+            entry.mean = float(f'{means[i]:.3f}')
+            # spare memory
+            del entry.series_abs
     for word in deletions:
         del vocab[word]
     return vocab
@@ -401,7 +479,7 @@ def gen_freqlist(mydir: str, *, langcodes: Union[str, Tuple[str, ...], None]=Non
     myvocab = refine_frequencies(myvocab, bins)
 
     # frequency computations
-    myvocab, timeseries = compute_frequencies(myvocab, bins)
+    myvocab, timeseries = compute_frequencies(myvocab, bins, interval=interval)
 
     # sum up frequencies
     myvocab = combine_frequencies(myvocab, bins, timeseries)
@@ -411,22 +489,19 @@ def gen_freqlist(mydir: str, *, langcodes: Union[str, Tuple[str, ...], None]=Non
 
 def store_freqlist(freqs: Dict[str, Entry], filename: str, thres_a: float=1, thres_b: float=0.2) -> None:
     "Write relevant (defined by frequency) long-term occurrences info to a file."
+    # only store statistically significant entries
+    rows = (
+        [word, entry.total, entry.mean, entry.stddev, entry.series_rel]
+        for word, entry in sorted(freqs.items())
+        if entry.stddev != 0 and (
+            entry.mean > thres_a or
+            (entry.mean > thres_b and entry.stddev < entry.mean/2)
+        )
+    )
     with open(filename, 'w', encoding='utf-8') as outfile:
         tsvwriter = csv.writer(outfile, delimiter='\t')
         tsvwriter.writerow(['word', 'total', 'mean', 'stddev', 'relfreqs'])
-        for entry in sorted(freqs):
-            # only store statistically significant entries
-            if freqs[entry].stddev == 0:
-                continue
-            if freqs[entry].mean > thres_a or \
-                (
-                    freqs[entry].mean > thres_b and \
-                    freqs[entry].stddev < freqs[entry].mean/2
-                ):
-                tsvwriter.writerow(
-                    [entry, freqs[entry].total, freqs[entry].mean,
-                     freqs[entry].stddev, freqs[entry].series_rel]
-                )
+        tsvwriter.writerows(rows)
 
 
 if __name__ == '__main__':
@@ -15,7 +15,7 @@ from unittest.mock import patch
 
 import pytest
 
-from shoten import apply_filters, calc_timediff, calculate_bins, combine_frequencies, compute_frequencies, dehyphen_vocab, filter_lemmaform, find_files, gen_freqlist, gen_wordlist, load_wordlist, pickle_wordinfo, putinvocab_multi, putinvocab_single, prune_vocab, refine_frequencies, refine_vocab, store_freqlist, unpickle_wordinfo
+from shoten import apply_filters, calc_timediff, calculate_bins, combine_frequencies, compute_frequencies, dehyphen_vocab, filter_lemmaform, find_files, gen_freqlist, gen_wordlist, load_wordlist, merge_vocab, pickle_wordinfo, putinvocab_multi, putinvocab_single, prune_vocab, read_file, refine_frequencies, refine_vocab, store_freqlist, unpickle_wordinfo
 from shoten.cli import main, parse_args, process_args
 from shoten.datatypes import Entry, flatten_series
 from shoten.filters import combined_filters, compound_filter, different_days_filter, frequency_filter, headings_filter, hyphenated_filter, is_relevant_input, longtermfilter, ngram_filter, oldest_filter, read_freqlist, recognized_by_simplemma, regex_filter, scoring_func, shortness_filter, sources_filter, sources_freqfilter, store_results, wordlist_filter, zipf_filter
@@ -50,6 +50,18 @@ def test_basics():
     # generate from XML file
     myvocab = gen_wordlist(str(Path(__file__).parent / 'testdir' / 'test2'), langcodes=('de'), maxdiff=10000)
     assert len(myvocab) == 1 and 'Telegram' in myvocab and myvocab['Telegram'].sources['horizont.at'] == 1
+    # XML declaration and missing text
+    inputfile = str(Path(__file__).parent / 'testdir' / 'test2' / 'inputfile2.xml')
+    with open(inputfile, 'r', encoding='utf-8') as filehandle:
+        teidoc = filehandle.read()
+    _, temp_inputfile = tempfile.mkstemp(suffix='.xml', text=True)
+    with open(temp_inputfile, 'w', encoding='utf-8') as filehandle:
+        filehandle.write('<?xml version="1.0" encoding="UTF-8"?>\n' + teidoc)
+    assert read_file(temp_inputfile, maxdiff=10000) == read_file(inputfile, maxdiff=10000)
+    with open(temp_inputfile, 'w', encoding='utf-8') as filehandle:
+        filehandle.write(re.sub(r'<text>.+</text>', '', teidoc, flags=re.S))
+    result = read_file(temp_inputfile, maxdiff=10000)
+    assert result is not None and result[0] == {} and result[2] == 'horizont.at'
     # write to file
     _, temp_outputfile = tempfile.mkstemp(suffix='.tsv', text=True)
     store_results(myvocab, temp_outputfile)
@@ -130,6 +142,13 @@ def test_internals():
     assert newvocab != myvocab
     assert len(newvocab['dehyphening'].time_series) == 4 and sum(newvocab['dehyphening'].time_series.values()) == 5
     assert newvocab['dehyphening'].headings is True
+    # merge partial vocabularies
+    newvocab = merge_vocab(deepcopy(myvocab), {
+        'dehyphening': ToEntry({'time_series': Counter([4, 5]), 'sources': Counter(['source1']), 'headings': True}),
+        'hyphening': ToEntry({'time_series': Counter([1]), 'sources': Counter(), 'headings': False})
+    })
+    assert len(newvocab) == 3 and newvocab['dehyphening'].time_series == {3: 1, 4: 2, 5: 1}
+    assert newvocab['dehyphening'].sources == {'source1': 1, 'source2': 1} and newvocab['dehyphening'].headings is True
 
     # refine vocab
     myvocab['Bergungen'] = ToEntry({'time_series': {5: 1}, 'sources': Counter(['source3']), 'headings': False})
@@ -137,6 +156,18 @@ def test_internals():
     assert 'Bergung' in newvocab and 'de-hyphening' in newvocab
     newvocab = refine_vocab(deepcopy(myvocab), lang='de', lemmafilter=True, dehyphenation=True)
     assert 'Bergungen' not in newvocab and 'Bergung' not in newvocab and 'de-hyphening' not in newvocab
+    # parallel lemmatization
+    with patch('shoten.shoten.LEMMA_BATCHSIZE', 2):
+        for lemmafilter in (False, True):
+            serial = refine_vocab(deepcopy(myvocab), lang='de', lemmafilter=lemmafilter, threads=1)
+            parallel = refine_vocab(deepcopy(myvocab), lang='de', lemmafilter=lemmafilter, threads=2)
+            assert serial.keys() == parallel.keys()
+            assert all(
+                serial[w].time_series == parallel[w].time_series and
+                serial[w].sources == parallel[w].sources and
+                serial[w].headings is parallel[w].headings
+                for w in serial
+            )
 
     # filter levels
     # defaults to normal
@@ -168,6 +199,20 @@ def test_internals():
     assert myvocab['Bergung'].series_rel == array('f', [0, 400000.0])
     assert myvocab['Meeresrauschen'].series_rel == array('f', [0, 600000.0])
 
+    # non-weekly time frames
+    myvocab = {
+        'Bergung': ToEntry({'time_series': Counter([1, 6, 7, 12, 21])}),
+        'Meeresrauschen': ToEntry({'time_series': Counter([1, 5, 9, 11, 14, 21])}),
+    }
+    bins = calculate_bins(myvocab, interval=5)
+    assert bins == [15, 10, 5]
+    myvocab = refine_frequencies(myvocab, bins)
+    myvocab, timeseries = compute_frequencies(myvocab, bins, interval=5)
+    assert myvocab['Bergung'].series_abs == array('H', [0, 1, 2])
+    assert myvocab['Meeresrauschen'].series_abs == array('H', [0, 2, 2])
+    assert timeseries == [0, 3, 4]
+    assert myvocab['Bergung'].total == 428571.429
+
 
 def test_cli():
     """Basic tests for command-line interface."""